@@ -4,10 +4,32 @@
 # -----------------------------
 
 import streamlit as st
-import requests
-import numpy as np
-import matplotlib.pyplot as plt
 import random
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+# orjson parses the NOAA payload faster but is optional
+try:
+    from orjson import loads as _loads_json
+except ImportError:
+    from json import loads as _loads_json
+
+from data import FUN_FACTS, SUNSPOT_YEARS, SUNSPOTS
+from dose_model import daily_dose, mission_dose, personal_risk
+
+# --------------------------------
+# Constants
+# --------------------------------
+APP_VERSION = "1.0"
+
+# Last NOAA reading is persisted here so restarts can skip the network
+FLUX_CACHE = Path.home() / ".astra_flux_cache.json"
+FLUX_CACHE_MAX_AGE = 300  # seconds
+
+# After a failed NOAA fetch, use the fallback without retrying for this long
+FLUX_RETRY_AFTER = 30  # seconds
 
 st.set_page_config(page_title="Cosmic Radiation Risk Calculator", layout="centered")
 
@@ -64,63 +86,151 @@ st.header("🌞 Live Solar Proton Flux")
 
 url = "https://services.swpc.noaa.gov/json/goes/primary/differential-proton-flux-1-day.json"
 
-try:
-    data = requests.get(url).json()
-    flux = float(data[-1]['flux'])
-    st.success(f"Live Proton Flux (≥10 MeV): {flux:.2e} protons/cm²/s/sr")
-except Exception as e:
-    flux = 100
-    st.warning(f"Unable to fetch live data. Using fallback flux: 100 p/cm²/s/sr")
 
-# --------------------------------
-# ☢ Dose Model
-# --------------------------------
+# Shared HTTP session so repeat fetches reuse the warm TLS connection.
+# Streamlit re-executes this script on every rerun, so the session is held
+# in cache_resource rather than rebuilt at module level each time.
+# requests is imported lazily so a cached flux never pays for it.
+@st.cache_resource(show_spinner=False)
+def _http_session():
+    import requests
+    from requests.adapters import HTTPAdapter
 
-# Split flare and normal days
-if solar_flare:
-    flare_days = min(2, mission_days)
-    normal_days = mission_days - flare_days
-else:
-    flare_days = 0
-    normal_days = mission_days
+    session = requests.Session()
+    session.headers.update({"Accept": "application/json"})
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    return session
 
-# Base dose (empirical scale)
-base_dose_per_day = flux * 0.00005
 
-# Shielding factor
-shield_factors = {'None': 1.0, 'Aluminum': 0.7, 'Polyethylene': 0.5}
-material_factor = shield_factors[shielding_material]
+def load_cached_flux(url: str, max_age: Optional[float] = FLUX_CACHE_MAX_AGE):
+    """(flux, ts) from the on-disk cache if it is fresh and for this URL, else None.
 
-# Thickness factor
-attenuation_factor = np.exp(-0.1 * thickness_cm) if shielding_material != "None" else 1.0
+    Pass max_age=None to accept an entry of any age, e.g. when offline.
+    """
+    try:
+        entry = json.loads(FLUX_CACHE.read_text())
+        age = time.time() - entry["ts"]
+        if entry.get("url") != url or (max_age is not None and not 0 <= age <= max_age):
+            return None
+        return float(entry["flux"]), float(entry["ts"])
+    except Exception:
+        return None
+
+
+def save_flux(url: str, flux: float) -> float:
+    """Write the latest flux to the on-disk cache; returns its timestamp even if the write fails."""
+    now = time.time()
+    entry = {
+        "ts": now,
+        "cached_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+        "flux": flux,
+        "url": url,
+        "app_version": APP_VERSION,
+    }
+    try:
+        FLUX_CACHE.write_text(json.dumps(entry))
+    except Exception:
+        pass
+    return now
+
+
+class FluxTimeout(Exception):
+    """NOAA did not answer within the request timeout."""
+
+
+class FluxUnavailable(Exception):
+    """NOAA could not be reached or returned unusable data."""
+
+
+@st.cache_data(ttl=FLUX_CACHE_MAX_AGE, show_spinner=False)
+def fetch_flux(url: str) -> tuple:
+    """(flux, ts) of the latest NOAA reading, from the disk cache when fresh."""
+    cached = load_cached_flux(url)
+    if cached is not None:
+        return cached
+    try:
+        import requests
+    except ImportError as e:
+        raise FluxUnavailable("requests is not installed") from e
+    try:
+        r = _http_session().get(url, timeout=(1.0, 2.0))  # (connect, read)
+        r.raise_for_status()
+        flux = float(_loads_json(r.content)[-1]['flux'])
+    except requests.Timeout as e:
+        raise FluxTimeout(str(e)) from e
+    except Exception as e:
+        raise FluxUnavailable(str(e)) from e
+    ts = save_flux(url, flux)
+    return flux, ts
+
+
+# st.cache_data does not cache exceptions, so failures are remembered here;
+# otherwise every rerun during an outage would block on the network again.
+# The kind is kept as a string because each rerun defines new exception classes.
+@st.cache_resource(show_spinner=False)
+def _flux_failure() -> dict:
+    return {"until": 0.0, "kind": "", "message": ""}
+
+
+def get_flux(url: str) -> float:
+    """Flux no older than FLUX_CACHE_MAX_AGE; a recent failure is re-raised without calling NOAA."""
+    failure = _flux_failure()
+    if time.time() < failure["until"]:
+        error = FluxTimeout if failure["kind"] == "timeout" else FluxUnavailable
+        raise error(failure["message"])
+    try:
+        flux, ts = fetch_flux(url)
+        # A disk entry keeps its original age in memory, so don't let the
+        # cache_data TTL extend it past FLUX_CACHE_MAX_AGE
+        if not 0 <= time.time() - ts <= FLUX_CACHE_MAX_AGE:
+            fetch_flux.clear()
+            flux, ts = fetch_flux(url)
+        return flux
+    except (FluxTimeout, FluxUnavailable) as e:
+        kind = "timeout" if isinstance(e, FluxTimeout) else "unavailable"
+        failure.update(until=time.time() + FLUX_RETRY_AFTER, kind=kind, message=str(e))
+        raise
+
+
+def fallback_flux(url: str, reason: str) -> float:
+    """Last saved reading of any age, else the default flux; warns which one is used."""
+    cached = load_cached_flux(url, max_age=None)
+    if cached is None:
+        st.warning(f"{reason} Using fallback flux: 100 p/cm²/s/sr")
+        return 100
+    flux, ts = cached
+    cached_at = time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(ts))
+    st.warning(f"{reason} Using cached value from {cached_at}: {flux:.2e} protons/cm²/s/sr")
+    return flux
 
-# Location factor
-location_factors = {
-    "Sea Level": 1,
-    "Airplane (~10 km)": 30,
-    "ISS Orbit (~400 km)": 250
-}
-location_factor = location_factors[location]
 
-# Solar cycle factor
-solar_factor = np.interp(solar_cycle, [0, 100], [1.2, 0.8])
+try:
+    flux = get_flux(url)
+    st.success(f"Live Proton Flux (≥10 MeV): {flux:.2e} protons/cm²/s/sr")
+except FluxTimeout:
+    flux = fallback_flux(url, "NOAA service is responding slowly.")
+except Exception:
+    flux = fallback_flux(url, "Unable to fetch live data.")
 
-# Final daily dose
-daily_dose = base_dose_per_day * material_factor * attenuation_factor * location_factor * solar_factor
+# --------------------------------
+# ☢ Dose Model
+# --------------------------------
 
-# Apply flare
-total_dose = daily_dose * normal_days + daily_dose * 10 * flare_days
+@st.cache_data(max_entries=128, show_spinner=False)
+def compute_dose(flux, mission_days, shielding_material, thickness_cm, location,
+                 solar_cycle, solar_flare, age, sex, genetic_sensitivity):
+    """Return (total_dose, risk_percent), memoised on the widget values."""
+    dose = mission_dose(
+        daily_dose(flux, shielding_material, thickness_cm, location, solar_cycle),
+        mission_days, solar_flare,
+    )
+    return dose, personal_risk(dose, age, sex, genetic_sensitivity)
 
-# Base risk
-risk_percent = (total_dose / 1000) * 5
 
-# Adjust for personal factors
-if age > 50:
-    risk_percent *= 1.1
-if sex == "Female":
-    risk_percent *= 1.2
-if genetic_sensitivity == "Yes":
-    risk_percent *= 1.5
+total_dose, risk_percent = compute_dose(
+    flux, mission_days, shielding_material, thickness_cm, location,
+    solar_cycle, solar_flare, age, sex, genetic_sensitivity,
+)
 
 # --------------------------------
 # 📊 Results
@@ -143,28 +253,28 @@ st.info(f"Approx. {total_dose/2.4:.1f} years of average Earth background dose (~
 # --------------------------------
 st.header("☀️ Historical Solar Cycle (Sunspot Number)")
 
-years = np.arange(2012, 2024)
-sunspots = [95, 80, 68, 55, 50, 40, 35, 60, 85, 95, 110, 120]  # Example
 
-fig, ax = plt.subplots()
-ax.plot(years, sunspots, marker='o')
-ax.set_xlabel("Year")
-ax.set_ylabel("Sunspot Number")
-ax.set_title("Approx. Sunspot Cycle")
-st.pyplot(fig)
+@st.cache_resource(show_spinner=False)
+def build_sunspot_fig():
+    """Sunspot chart never changes, so the Figure is built once and reused."""
+    import matplotlib
+    matplotlib.use("Agg")  # headless server; skip interactive backend probing
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot(SUNSPOT_YEARS, SUNSPOTS, marker='o')
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Sunspot Number")
+    ax.set_title("Approx. Sunspot Cycle")
+    return fig
+
+
+st.pyplot(build_sunspot_fig())
 
 # --------------------------------
 # ✨ Fun Fact
 # --------------------------------
-fun_facts = [
-    "💡 Did you know? The ISS crew receives 80–160 mSv per 6-month mission.",
-    "💡 Cosmic rays can flip bits in satellites — Single Event Upsets (SEUs).",
-    "💡 Airline pilots get ~3 mSv/year due to high-altitude exposure.",
-    "💡 Mars has no magnetic shield → cosmic rays freely hit its surface.",
-    "💡 Solar storms can disrupt power grids & satellites on Earth!"
-]
-
 st.sidebar.header("✨ Cosmic Fact")
-st.sidebar.info(random.choice(fun_facts))
+st.sidebar.info(random.choice(FUN_FACTS))
 
 st.caption("🔬 Educational tool only — not for medical or mission planning use.")
@@ -0,0 +1,18 @@
+# -----------------------------
+# Static Display Data
+# Imported once, so it is not rebuilt on every Streamlit rerun
+# -----------------------------
+
+import numpy as np
+
+# Example sunspot numbers, one per year
+SUNSPOT_YEARS = np.arange(2012, 2024)
+SUNSPOTS = np.array([95, 80, 68, 55, 50, 40, 35, 60, 85, 95, 110, 120], dtype=np.int16)
+
+FUN_FACTS = (
+    "💡 Did you know? The ISS crew receives 80–160 mSv per 6-month mission.",
+    "💡 Cosmic rays can flip bits in satellites — Single Event Upsets (SEUs).",
+    "💡 Airline pilots get ~3 mSv/year due to high-altitude exposure.",
+    "💡 Mars has no magnetic shield → cosmic rays freely hit its surface.",
+    "💡 Solar storms can disrupt power grids & satellites on Earth!",
+)
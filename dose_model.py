@@ -0,0 +1,65 @@
+# -----------------------------
+# Cosmic Radiation Dose Model
+# Pure math shared by the Streamlit UI
+# -----------------------------
+
+import math
+
+# --------------------------------
+# Constants
+# --------------------------------
+SHIELD_FACTORS = {'None': 1.0, 'Aluminum': 0.7, 'Polyethylene': 0.5}
+
+LOCATION_FACTORS = {
+    "Sea Level": 1,
+    "Airplane (~10 km)": 30,
+    "ISS Orbit (~400 km)": 250
+}
+
+SEX_RISK_FACTORS = {"Male": 1.0, "Female": 1.2}
+
+GENETIC_RISK_FACTORS = {"No": 1.0, "Yes": 1.5}
+
+# Solar flare: 10x flux for (up to) 2 days
+FLARE_FLUX_MULT = 10
+FLARE_DAYS = 2
+
+
+# --------------------------------
+# ☢ Dose Model
+# --------------------------------
+def daily_dose(flux, shielding_material, thickness_cm, location, solar_cycle):
+    """Daily dose in mSv for the given flux and mission environment."""
+    # Base dose (empirical scale)
+    base_dose_per_day = flux * 0.00005
+
+    # Shielding factor
+    material_factor = SHIELD_FACTORS[shielding_material]
+
+    # Thickness factor
+    attenuation_factor = math.exp(-0.1 * thickness_cm) if shielding_material != "None" else 1.0
+
+    # Location factor
+    location_factor = LOCATION_FACTORS[location]
+
+    # Solar cycle factor
+    solar_factor = 1.2 - 0.004 * solar_cycle  # linear 1.2 -> 0.8 over 0..100
+
+    return base_dose_per_day * material_factor * attenuation_factor * location_factor * solar_factor
+
+
+def mission_dose(daily, mission_days, solar_flare):
+    """Mission dose in mSv, counting flare days at FLARE_FLUX_MULT times the daily dose."""
+    # Flare days count FLARE_FLUX_MULT times; int(solar_flare) masks them out when off
+    flare_extra_days = (FLARE_FLUX_MULT - 1) * int(solar_flare) * min(FLARE_DAYS, mission_days)
+    return daily * (mission_days + flare_extra_days)
+
+
+def personal_risk(dose, age, sex, genetic_sensitivity):
+    """Estimated cancer risk in percent for a total dose and personal factors."""
+    # Base risk
+    risk_percent = (dose / 1000) * 5
+
+    # Adjust for personal factors
+    age_mult = 1.1 if age > 50 else 1.0
+    return risk_percent * age_mult * SEX_RISK_FACTORS[sex] * GENETIC_RISK_FACTORS[genetic_sensitivity]